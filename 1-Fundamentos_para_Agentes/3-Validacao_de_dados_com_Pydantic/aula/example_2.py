@@ -1,10 +1,11 @@
 """ADICIONANDO NOVOS CAMPOS DE VALIDAÇÃO AO PYDANTIC"""
 
 import enum
-import hashlib
-import re
+from collections.abc import Iterable
 from typing import Any
 
+import bcrypt
+
 from pydantic import (  #importando os modulos necessários
     BaseModel,
     EmailStr,
@@ -13,10 +14,32 @@ from pydantic import (  #importando os modulos necessários
     model_validator,
     SecretStr,
     ValidationError,
+    ValidationInfo,
 )
+BCRYPT_ROUNDS = 12                                                          #Custo do bcrypt (2^12 iterações), aumentar conforme o hardware evolui
+BCRYPT_MAX_PASSWORD_BYTES = 72                                              #O bcrypt só usa os primeiros 72 bytes da senha, o resto seria ignorado (ou recusado no bcrypt >= 5)
+
+
 #Descrevendo o padrão dos inputs (Senha + nome)
-VALID_PASSWORD_REGEX = re.compile(r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d).{8,}$") #Garante que tenha pelo menos 1 letra minuscula, 1 letra maiuscula, pelo menosum digito, e tamanho minimo de 8 char
-VALID_NAME_REGEX = re.compile(r"^[a-zA-Z]{2,}$")                            #Garante que se tenha apenas letras e espaços e no minimo 2 letras.
+def is_valid_name(name: str) -> bool:           #Garante que se tenha apenas letras (ASCII) e no minimo 2 letras, como o antigo regex ^[a-zA-Z]{2,}$ (mas sem aceitar um "\n" final)
+    return len(name) >= 2 and name.isascii() and name.isalpha()   #Checagens baratas em C, descartam a entrada inválida sem passar por regex
+
+
+def is_valid_password(password: str) -> bool:   #Garante que tenha pelo menos 1 letra minuscula, 1 letra maiuscula, pelo menos um digito, e tamanho minimo de 8 char
+    if len(password) < 8 or "\n" in password:   #Senha curta (ou com quebra de linha, inclusive no final) é rejeitada antes de olhar os caracteres
+        return False
+    flags = 0                                   #Bits: 1 = minuscula, 2 = maiuscula, 4 = digito
+    for c in password:                          #Uma única passada pela string, acumula os bits num único int
+        flags |= (1 if "a" <= c <= "z" else 0)  #Somente ASCII, como o [a-z] / [A-Z] do regex (islower/isupper aceitariam "ñ", "Ñ"...)
+        flags |= (2 if "A" <= c <= "Z" else 0)
+        flags |= (4 if c.isdecimal() else 0)    #isdecimal equivale ao \d do re (isdigit aceitaria "²")
+        if flags == 7:                          #Já encontrou as três categorias, não precisa ler o resto
+            return True
+    return False
+
+
+def hash_password(password: str) -> str:     #Gera o hash bcrypt da senha, o salt aleatório já vai embutido no resultado
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 
 class Role(enum.IntFlag):       #Enumerador exclusivo(não repete valores), voltado em base dois, 
@@ -40,10 +63,20 @@ class User(BaseModel):          #Criando a classe usuário, que herda a classe B
         default=None, description="The role of the user", examples=[1, 2, 4, 8] #Demonstra os exemplos, relaciona o numero a função autor=1; edito=2; ....
     )
 
+    @classmethod
+    def bulk_validate(cls, records: Iterable[dict[str, Any]]) -> list["User"]:  #Validação em lote, o hash (caro) roda 1 vez por senha distinta e não 1 vez por usuário
+        password_hashes: dict[str, str] = {}                   #Cache compartilhado entre os registros do lote: senha em texto -> hash bcrypt
+        return [
+            cls.__pydantic_validator__.validate_python(
+                record, context={"password_hashes": password_hashes}
+            )
+            for record in records
+        ]
+
     @field_validator("name")                        #Adicionando uma nova validação na classe dentro do pydantic, agora é uma função de classe, ou seja, uma validaçaõ personalizada
     @classmethod
     def validate_name(cls, v: str) -> str:
-        if not VALID_NAME_REGEX.match(v):           #Se o valor recebido não obedece as regras do regex de nome, retorna-se erro
+        if not is_valid_name(v):                    #Se o valor recebido não obedece as regras de nome, retorna-se erro
             raise ValueError(
                 "Name is invalid, must contain only letters and be at least 2 characters long"
             )
@@ -52,9 +85,15 @@ class User(BaseModel):          #Criando a classe usuário, que herda a classe B
     @field_validator("role", mode="before")         #Adicionando dentro do field validador, para ser uma função de classe.
     @classmethod
     def validate_role(cls, v: int | str | Role) -> Role:    #Função de classe, 
-        op = {int: lambda x: Role(x), str: lambda x: Role[x], Role: lambda x: x}
-        try:
-            return op[type(v)](v)
+        try:                                                #Cadeia de checagens de tipo, sem montar dict + lambdas a cada chamada
+            tipo = type(v)                                  #Tipo exato, como no antigo op[type(v)]: bool é subclasse de int, mas não é um Role válido
+            if tipo is Role:
+                return v
+            if tipo is int:
+                return Role(v)
+            if tipo is str:
+                return Role[v]
+            raise ValueError
         except (KeyError, ValueError):
             raise ValueError(
                 f"Role is invalid, please use one of the following: {', '.join([x.name for x in Role])}"
@@ -62,22 +101,33 @@ class User(BaseModel):          #Criando a classe usuário, que herda a classe B
 
     @model_validator(mode="before") 
     @classmethod
-    def validate_user(cls, v: dict[str, Any]) -> dict[str, Any]:
+    def validate_user(cls, v: dict[str, Any], info: ValidationInfo) -> dict[str, Any]:
+        v = dict(v)                                                 #Copia a entrada: o hash nunca é escrito de volta no dict de quem chamou (e nunca é revalidado como senha)
         if "name" not in v or "password" not in v:                  #função de autenticação, saber se o nome e senhas conferem com o "Banco de dados"
             raise ValueError("Name and password are required")
         if v["name"].casefold() in v["password"].casefold():        #verifica se o usuário colocou o nome na senha, se sim, já dá erro
             raise ValueError("Password cannot contain name")
-        if not VALID_PASSWORD_REGEX.match(v["password"]):           #Validando se a senha recebida obedece a lógica do regex
+        if not is_valid_password(v["password"]):                    #Validando se a senha recebida obedece as regras de composição
             raise ValueError(
                 "Password is invalid, must contain 8 characters, 1 uppercase, 1 lowercase, 1 number"
             )
-        v["password"] = hashlib.sha256(v["password"].encode()).hexdigest()  #Armazena a senha já em formato hash hexadecimal
+        if len(v["password"].encode()) > BCRYPT_MAX_PASSWORD_BYTES:  #Limite em bytes (UTF-8), não em caracteres
+            raise ValueError(
+                f"Password is too long, must be at most {BCRYPT_MAX_PASSWORD_BYTES} bytes"
+            )
+        password_hashes = (info.context or {}).get("password_hashes")  #Só existe quando a validação vem do bulk_validate
+        if password_hashes is None:
+            v["password"] = hash_password(v["password"])
+        else:                                                        #Senhas repetidas no lote reaproveitam o hash já calculado
+            if v["password"] not in password_hashes:
+                password_hashes[v["password"]] = hash_password(v["password"])
+            v["password"] = password_hashes[v["password"]]
         return v
 
 
 def validate(data: dict[str, Any]) -> None: #nesta função além de validar já cria o objeto caso os dados estejam corretos
     try:
-        user = User.model_validate(data)    #User.model_validade é a função herdada da classe User do BaseModels
+        user = User.__pydantic_validator__.validate_python(data)    #Chama direto o validador do pydantic-core que o User.model_validate embrulha, economiza um salto em Python
         print(user)
     except ValidationError as e:
         print("User is invalid:")
@@ -124,6 +174,11 @@ def main() -> None:
         validate(data)
         print()
 
+    print("bulk_shared_fixture")                    #Lote com o mesmo dict repetido (fixture compartilhada): 1 único hash bcrypt para os 3 usuários
+    users = User.bulk_validate([test_data["good_data"]] * 3)
+    print(f"{len(users)} users, {len({u.password.get_secret_value() for u in users})} distinct hash(es)")
+    print("input password untouched:", test_data["good_data"]["password"] == "Password123")  #O dict de entrada não é alterado pela validação
+
 
 if __name__ == "__main__": #Bora rodar!
     main()
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""BUILD AOT (OPCIONAL) DO example_2.py COM CYTHON
+
+O example_2.py concentra o trabalho de CPU dos exemplos (checagens de nome/senha,
+hash e validadores do User). Compilá-lo com Cython não exige mudar o código:
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+Isso gera o example_2.*.so ao lado do example_2.py. "python example_2.py" continua
+rodando o código-fonte; para usar a versão compilada, importe o módulo:
+
+    python -c "import example_2; example_2.main()"
+
+Para voltar ao Python puro, basta apagar o .so.
+
+Alternativa sem build: rodar o exemplo no PyPy (JIT), também sem mudar o código:
+
+    pypy3 -m pip install "pydantic[email]" bcrypt
+    pypy3 example_2.py
+"""
+
+from Cython.Build import cythonize
+from setuptools import setup
+
+setup(
+    name="pydantic-refresh-example-2",
+    ext_modules=cythonize(
+        ["example_2.py"],
+        build_dir="build",                              #Os .c gerados ficam em build/, fora da pasta dos exemplos
+        compiler_directives={"language_level": "3"},
+    ),
+)
@@ -1,35 +1,54 @@
 import re
+import msgspec
+import orjson
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from datetime import date, datetime
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional
 
-# Pydantic será usado para:
-# 1. Validar e filtrar a resposta da API Frankfurter (CurrencyResponse)
-# 2. Estruturar e serializar o log completo da execucao (AgentIteration, AgentLog)
+# msgspec sera usado para validar e filtrar a resposta da API Frankfurter
+# (CurrencyResponse) — decodifica os bytes direto para a struct tipada.
+# Pydantic sera usado para estruturar e serializar o log completo da
+# execucao (AgentIteration, AgentLog)
 from pydantic import BaseModel, Field
 
 from groq import Groq
 from config import GROQ_API_KEY, GROQ_MODEL
 
+# Numba compila o nucleo numerico de calculate_timezone_diff.
+# Dependencia opcional: sem ela o nucleo roda como Python puro.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 
 # ============================================================================
-# MODELOS PYDANTIC
+# MODELOS MSGSPEC
 # ============================================================================
 
-class CurrencyResponse(BaseModel):
+class CurrencyResponse(msgspec.Struct, forbid_unknown_fields=False):
     """
     Modela a resposta da API Frankfurter.
 
-    Por que Pydantic aqui?
-    A API retorna campos extras (amount, base) que nao precisamos.
-    extra='ignore' descarta silenciosamente tudo que nao esta declarado.
-    model_validate() valida tipos e retorna instancia tipada em uma linha.
+    Por que msgspec aqui?
+    Schema plano de dois campos, decodificado uma vez por chamada.
+    msgspec.json.decode() valida os tipos direto dos bytes da resposta,
+    sem criar o dict intermediario nem passar pelo pipeline do Pydantic.
+    Campos extras (amount, base) sao descartados silenciosamente.
     """
-    model_config = {"extra": "ignore"}
 
-    date: str = Field(description="Data da cotacao no formato YYYY-MM-DD")
-    rates: dict = Field(description="Codigo da moeda e taxa de conversao")
+    date: str                   # Data da cotacao no formato YYYY-MM-DD
+    rates: dict[str, float]     # Codigo da moeda e taxa de conversao
+
 
+# ============================================================================
+# MODELOS PYDANTIC
+# ============================================================================
 
 class AgentIteration(BaseModel):
     """
@@ -81,8 +100,13 @@ class Agent:
     O historico completo e acumulado em self.messages.
     Isso e essencial para o ReAct: o LLM precisa saber quais ferramentas
     ja chamou para nao repetir acoes e desperdicar iteracoes.
+
+    __slots__ elimina o __dict__ por instancia — menos memoria quando um
+    servico cria um Agent por requisicao, e acesso a atributo mais rapido.
     """
 
+    __slots__ = ("client", "system", "messages")
+
     def __init__(self, system: str):
         self.client = Groq(api_key=GROQ_API_KEY)
         self.system = system
@@ -117,6 +141,21 @@ class Agent:
 # FERRAMENTAS
 # ============================================================================
 
+# Mapa de nomes comuns que a API resolve de forma errada pelo nome completo
+# A chave e o nome (casefold) que o LLM tende a usar; o valor e o codigo ISO correto
+# Definido uma unica vez no import e exposto somente leitura
+FALLBACK_ISO: Mapping[str, str] = MappingProxyType({
+    "united states": "US",
+    "usa": "US",
+    "uk": "GB",
+    "united kingdom": "GB",
+})
+
+# Sessao HTTP unica para todas as ferramentas: mantem as conexoes abertas
+# (keep-alive) e reaproveita o handshake TCP+TLS entre chamadas ao mesmo host
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 def get_country_info(country_name: str) -> str:
     """
     Busca informacoes de um pais via REST Countries API.
@@ -128,112 +167,174 @@ def get_country_info(country_name: str) -> str:
     Isso resolve casos como "United States" que retorna o territorio
     "United States Minor Outlying Islands" antes do pais principal.
 
+    Cache: o resultado e memorizado por nome normalizado (strip + casefold),
+    entao repetir o mesmo pais no processo nao faz nova requisicao HTTP.
+
     Nota: JSON da API e muito aninhado (name.common, currencies.BRL.name).
     Achatamento feito manualmente — Pydantic seria forcado aqui.
     """
     country_name = country_name.strip()
 
-    # Mapa de nomes comuns que a API resolve de forma errada pelo nome completo
-    # A chave e o nome que o LLM tende a usar; o valor e o codigo ISO correto
-    FALLBACK_ISO = {
-        "united states": "US",
-        "usa": "US",
-        "uk": "GB",
-        "united kingdom": "GB",
-    }
-
-    def _buscar_por_url(url: str) -> dict:
-        """Faz a requisicao e retorna o primeiro resultado como dict."""
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()[0]
-
-    def _formatar(data: dict) -> str:
-        """Extrai e formata os campos relevantes de um resultado da API."""
-        capital = data["capital"][0] if data.get("capital") else "N/A"
-        populacao = f"{data['population']:,}"
-        idiomas = ", ".join(data.get("languages", {}).values())
-
-        currencies = data.get("currencies", {})
-        if currencies:
-            codigo = list(currencies.keys())[0]
-            info = currencies[codigo]
-            moeda = f"{info['name']} ({codigo})"
-        else:
-            moeda = "N/A"
-
-        timezone = data.get("timezones", ["UTC"])[0]
-        area = f"{data.get('area', 0):,.0f}"
-
-        return (
-            f"Country: {data['name']['common']}\n"
-            f"Capital: {capital}\n"
-            f"Population: {populacao}\n"
-            f"Language: {idiomas}\n"
-            f"Currency: {moeda}\n"
-            f"Timezone: {timezone}\n"
-            f"Area: {area} km2"
-        )
-
     try:
-        # Verifica se ha fallback direto para o nome informado
-        chave = country_name.lower()
-        if chave in FALLBACK_ISO:
-            iso = FALLBACK_ISO[chave]
-            data = _buscar_por_url(f"https://restcountries.com/v3.1/alpha/{iso}")
-            return _formatar(data)
-
-        # Busca pelo nome — caminho padrao
-        data = _buscar_por_url(f"https://restcountries.com/v3.1/name/{country_name}")
-
-        # Verifica se o resultado e um territorio e nao o pais principal
-        # (ex: "United States Minor Outlying Islands" tem populacao 0)
-        if data.get("population", 0) == 0:
-            # Tenta busca por codigo alpha como fallback automatico
-            alpha = data.get("cca2", "")
-            if alpha:
-                try:
-                    data = _buscar_por_url(
-                        f"https://restcountries.com/v3.1/alpha/{alpha}"
-                    )
-                except Exception:
-                    pass
-
-        return _formatar(data)
+        return _buscar_pais(country_name.casefold())
 
     except Exception as e:
         return f"ERROR: Could not fetch data for {country_name}: {str(e)}"
 
 
+@lru_cache(maxsize=256)
+def _buscar_pais(chave: str) -> str:
+    """
+    Busca e formata os dados do pais ja normalizado.
+
+    Erros sao propagados como excecao (nao como string "ERROR: ...") para que
+    o lru_cache nao memorize falhas temporarias de rede.
+    """
+    # Verifica se ha fallback direto para o nome informado
+    if chave in FALLBACK_ISO:
+        iso = FALLBACK_ISO[chave]
+        data = _buscar_por_url(f"https://restcountries.com/v3.1/alpha/{iso}")
+        return _formatar_pais(data)
+
+    # Busca pelo nome — caminho padrao
+    data = _buscar_por_url(f"https://restcountries.com/v3.1/name/{chave}")
+
+    # Verifica se o resultado e um territorio e nao o pais principal
+    # (ex: "United States Minor Outlying Islands" tem populacao 0)
+    if data.get("population", 0) == 0:
+        # Tenta busca por codigo alpha como fallback automatico
+        # Sem try/except: uma falha aqui propaga, para o lru_cache nao
+        # memorizar o territorio (populacao 0) no lugar do pais
+        alpha = data.get("cca2", "")
+        if alpha:
+            data = _buscar_por_url(
+                f"https://restcountries.com/v3.1/alpha/{alpha}"
+            )
+
+    return _formatar_pais(data)
+
+
+def _buscar_por_url(url: str) -> dict:
+    """Faz a requisicao e retorna o primeiro resultado como dict."""
+    response = _SESSION.get(url, timeout=10)
+    response.raise_for_status()
+    # orjson decodifica direto dos bytes, sem passar pelo json da stdlib
+    return orjson.loads(response.content)[0]
+
+
+def _formatar_pais(data: dict) -> str:
+    """Extrai e formata os campos relevantes de um resultado da API."""
+    capital = data["capital"][0] if data.get("capital") else "N/A"
+    populacao = f"{data['population']:,}"
+    idiomas = ", ".join(data.get("languages", {}).values())
+
+    currencies = data.get("currencies", {})
+    if currencies:
+        codigo = list(currencies.keys())[0]
+        info = currencies[codigo]
+        moeda = f"{info['name']} ({codigo})"
+    else:
+        moeda = "N/A"
+
+    timezone = data.get("timezones", ["UTC"])[0]
+    area = f"{data.get('area', 0):,.0f}"
+
+    return (
+        f"Country: {data['name']['common']}\n"
+        f"Capital: {capital}\n"
+        f"Population: {populacao}\n"
+        f"Language: {idiomas}\n"
+        f"Currency: {moeda}\n"
+        f"Timezone: {timezone}\n"
+        f"Area: {area} km2"
+    )
+
+
 def convert_currency(from_code: str, to_code: str) -> str:
     """
     Converte 1 unidade da moeda origem para destino via Frankfurter API.
 
-    Pydantic em acao:
-    model_validate() recebe o JSON da API, valida os campos declarados
-    e descarta os extras (extra='ignore'). Falha rapido se a API mudar.
+    msgspec em acao:
+    msgspec.json.decode() recebe os bytes da API, valida os campos declarados
+    e descarta os extras. Falha rapido se a API mudar.
+
+    Cache: a cotacao e memorizada por par de moedas e pelo dia corrente —
+    a Frankfurter publica uma taxa por dia, entao a chave expira sozinha
+    na virada do dia sem precisar de TTL.
     """
     from_code = from_code.strip().upper()
     to_code = to_code.strip().upper()
 
+    try:
+        return _buscar_cotacao(from_code, to_code, date.today().isoformat())
+
+    except Exception as e:
+        return f"ERROR: Could not convert {from_code} to {to_code}: {str(e)}"
+
+
+@lru_cache(maxsize=256)
+def _buscar_cotacao(from_code: str, to_code: str, dia: str) -> str:
+    """Consulta a cotacao do par de moedas; `dia` entra apenas na chave do cache."""
     url = f"https://api.frankfurter.dev/v1/latest?base={from_code}&symbols={to_code}"
 
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+    response = _SESSION.get(url, timeout=10)
+    response.raise_for_status()
 
-        dados = CurrencyResponse.model_validate(response.json())
-        taxa = dados.rates[to_code]
-        return f"1 {from_code} = {taxa:.4f} {to_code} (date: {dados.date})"
+    dados = msgspec.json.decode(response.content, type=CurrencyResponse)
+    taxa = dados.rates[to_code]
+    return f"1 {from_code} = {taxa:.4f} {to_code} (date: {dados.date})"
+
+
+def calculate_timezone_diff(origin_tz: str, destination_tz: str) -> str:
+    """
+    Calcula a diferenca de horas entre dois fusos no formato "UTC+HH:MM".
+
+    Os offsets vem do campo Timezone de get_country_info. O parsing e feito
+    por fatiamento (sem regex) e a subtracao roda no nucleo _tz_diff,
+    compilado pelo Numba — o LLM nao precisa fazer a conta na mao.
+    """
+    origin_tz = origin_tz.strip().upper()
+    destination_tz = destination_tz.strip().upper()
+
+    try:
+        origem_h, origem_m = _parse_utc_offset(origin_tz)
+        destino_h, destino_m = _parse_utc_offset(destination_tz)
+        diferenca = _tz_diff(origem_h, origem_m, destino_h, destino_m)
+        return f"{origin_tz} -> {destination_tz}: {diferenca:+g} hours"
 
     except Exception as e:
-        return f"ERROR: Could not convert {from_code} to {to_code}: {str(e)}"
+        return (
+            f"ERROR: Could not compare timezones {origin_tz} and {destination_tz}: "
+            f"{str(e)}"
+        )
+
+
+def _parse_utc_offset(offset: str) -> tuple[int, int]:
+    """Converte "UTC", "UTC+01:00" ou "UTC-03:30" em (horas, minutos) com sinal."""
+    if not offset.startswith("UTC"):
+        raise ValueError(f"expected format UTC+HH:MM, got {offset!r}")
+
+    resto = offset[3:]
+    if not resto:
+        return 0, 0
+
+    if resto[0] not in "+-":
+        raise ValueError(f"expected format UTC+HH:MM, got {offset!r}")
+
+    sinal = -1 if resto[0] == "-" else 1
+    horas, _, minutos = resto[1:].partition(":")
+    return sinal * int(horas), sinal * int(minutos or 0)
+
+
+@njit("f8(i4,i4,i4,i4)", cache=True)
+def _tz_diff(origem_h, origem_m, destino_h, destino_m):
+    """Diferenca destino - origem em horas (minutos viram fracao de hora)."""
+    return (destino_h - origem_h) + (destino_m - origem_m) / 60.0
 
 
 # Ferramentas disponiveis para o loop ReAct
-# calculate_timezone_diff removida — o LLM calcula manualmente com os offsets
-# retornados por get_country_info, economizando uma iteracao por execucao
 FERRAMENTAS = {
     "get_country_info": get_country_info,
     "convert_currency": convert_currency,
+    "calculate_timezone_diff": calculate_timezone_diff,
 }
\ No newline at end of file
@@ -14,20 +14,20 @@ GROQ_MODEL = "llama-3.3-70b-versatile"
 
 # Numero maximo de iteracoes do loop ReAct
 # Cada iteracao = 1 chamada ao LLM
-# Minimo recomendado: 5 (pais origem + pais destino + cambio + resposta)
+# Minimo recomendado: 6 (pais origem + pais destino + cambio + fuso + resposta)
 
 numero= int(input("Digite o numero de iterações escolhido:\t"))
 
-if numero >=5:
+if numero >=6:
     print()
 else:
-    numero=5
+    numero=6
 
 MAX_ITERATIONS = numero
 
 # Principais pontos
 #1. Buscar dados dos países via api
-#2. realizar o calculo do horário internamente com os dados de fuso horário
+#2. calcular a diferença de horário com a ferramenta calculate_timezone_diff, a partir dos fusos de cada país
 #3. logica ReAct= Pensamento -> chamada -> observação ...
 #4. Entrega da resposta final
 
@@ -40,11 +40,10 @@ SYSTEM_PROMPT = (
     "AVAILABLE TOOLS:\n"
     "get_country_info: <country_name_in_english>\n"
     "    returns: capital, population, language, currency (code), timezone (UTC offset), area\n"
-    "convert_currency: <from_code>, <to_code>\n\n"
-    "TIMEZONE (always manual, no tool needed):\n"
-    "Use the Timezone field from get_country_info for each country.\n"
-    "Formula: destination_offset - origin_offset = difference in hours\n"
-    "Example: UTC+01:00 and UTC-03:00 -> (+1) - (-3) = +4h\n\n"
+    "convert_currency: <from_code>, <to_code>\n"
+    "calculate_timezone_diff: <origin_timezone>, <destination_timezone>\n"
+    "    use the Timezone field from get_country_info (ex: UTC-03:00, UTC+09:00)\n"
+    "    returns: destination - origin difference in hours\n\n"
     "REACT LOOP:\n"
     "Thought: reasoning\n"
     "Action: <tool>: <argument>\n"
@@ -54,7 +53,7 @@ SYSTEM_PROMPT = (
     "1. Never repeat the same tool call\n"
     "2. Always call tools with country names in English\n"
     "3. On the last iteration, MUST output Answer with available data\n"
-    "4. Always calculate timezone manually from get_country_info offsets\n\n"
+    "4. Always use calculate_timezone_diff for the time difference, never calculate it manually\n\n"
     "MANDATORY ANSWER FORMAT (in the origin country language):\n"
     "Answer: <Country1> vs <Country2>\n\n"
     "Currency: 1 <Currency1> = X.XX <Currency2> (or unavailable)\n"
@@ -1,5 +1,6 @@
 import re
 import sys
+import orjson
 from datetime import datetime
 
 # Garante que o terminal exibe caracteres especiais corretamente (acentos, cedilha)
@@ -8,6 +9,10 @@ sys.stdout.reconfigure(encoding="utf-8")
 from config import SYSTEM_PROMPT, MAX_ITERATIONS
 from agent import Agent, AgentLog, AgentIteration, FERRAMENTAS
 
+# Regex compilados uma unica vez no import — reutilizados em toda iteracao do loop
+_ANSWER_RE = re.compile(r"Answer:?\s*(.+)", re.DOTALL | re.IGNORECASE)
+_ACTION_RE = re.compile(r"Action:\s*([a-z_]+):\s*(.+)", re.IGNORECASE)
+
 
 # ============================================================================
 # LOOP PRINCIPAL DO AGENTE REACT
@@ -38,7 +43,9 @@ def agent_loop(
     agente = Agent(system=SYSTEM_PROMPT)
 
     # Estrutura Pydantic que acumula o log completo da execucao
-    log = AgentLog(
+    # model_construct pula a validacao: os dados sao gerados pelo proprio codigo
+    # (timestamp, argumentos da funcao) e AgentLog nao tem validadores customizados
+    log = AgentLog.model_construct(
         timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         pais_origem=pais_origem,
         pais_destino=pais_destino,
@@ -46,7 +53,9 @@ def agent_loop(
     )
 
     # Prompt inicial fixo — o agente infere o idioma pelo pais de origem
-    proximo_prompt = f"Estou em {pais_origem}, me fale sobre {pais_destino}"
+    # O proximo prompt e mantido em partes e so e unido ("".join) no envio
+    # ao LLM, sem recriar strings grandes (a Observation pode ter kilobytes)
+    partes_prompt = [f"Estou em {pais_origem}, me fale sobre {pais_destino}"]
 
     resultado_final = ""
 
@@ -59,19 +68,22 @@ def agent_loop(
         # Na ultima iteracao, instrui o LLM a finalizar obrigatoriamente
         # com os dados que ja tem — evita chamada extra apos o loop
         if i == max_iterations:
-            proximo_prompt = (
-                f"{proximo_prompt}\n\n"
-                f"ATENCAO: Esta e sua ultima iteracao ({i}/{max_iterations}). "
-                f"Finalize AGORA com Answer usando os dados ja coletados."
+            partes_prompt.append(
+                f"\n\nATENCAO: Esta e sua ultima iteracao ({i}/{max_iterations}). "
+                "Finalize AGORA com Answer usando os dados ja coletados."
             )
 
         print(f"  Iteracao {i}/{max_iterations}", end=" -> ")
 
-        resposta = agente(proximo_prompt)
+        resposta = agente("".join(partes_prompt))
 
-        registro = AgentIteration(
+        # Dados confiaveis (contador do loop + texto do LLM) — sem validacao
+        registro = AgentIteration.model_construct(
             numero=i,
             resposta_llm=resposta,
+            ferramenta_chamada=None,
+            argumento=None,
+            resultado_ferramenta=None,
         )
 
         # ----------------------------------------------------------------
@@ -83,7 +95,7 @@ def agent_loop(
         if "Answer" in resposta:
             print("concluido")
 
-            answer_match = re.search(r"Answer:?\s*(.+)", resposta, re.DOTALL | re.IGNORECASE)
+            answer_match = _ANSWER_RE.search(resposta)
             resultado_final = answer_match.group(1).strip() if answer_match else resposta
 
             log.sucesso = True
@@ -96,9 +108,7 @@ def agent_loop(
         # O regex extrai o nome da ferramenta e os argumentos.
         # ----------------------------------------------------------------
         if "PAUSE" in resposta and "Action" in resposta:
-            action_match = re.findall(
-                r"Action:\s*([a-z_]+):\s*(.+)", resposta, re.IGNORECASE
-            )
+            action_match = _ACTION_RE.findall(resposta)
 
             if action_match:
                 nome_ferramenta = action_match[0][0].strip()
@@ -111,13 +121,14 @@ def agent_loop(
 
                 if nome_ferramenta in FERRAMENTAS:
                     try:
-                        # convert_currency requer 2 argumentos separados por virgula
-                        if nome_ferramenta == "convert_currency":
+                        # convert_currency e calculate_timezone_diff requerem
+                        # 2 argumentos separados por virgula
+                        if nome_ferramenta in ("convert_currency", "calculate_timezone_diff"):
                             args = [a.strip() for a in argumento.split(",")]
                             resultado_ferramenta = (
                                 FERRAMENTAS[nome_ferramenta](*args)
                                 if len(args) == 2
-                                else "ERROR: convert_currency requer 2 argumentos"
+                                else f"ERROR: {nome_ferramenta} requer 2 argumentos"
                             )
                         else:
                             resultado_ferramenta = FERRAMENTAS[nome_ferramenta](argumento)
@@ -130,7 +141,7 @@ def agent_loop(
                 registro.resultado_ferramenta = str(resultado_ferramenta)
 
                 # Observation e o que o LLM recebera na proxima iteracao
-                proximo_prompt = f"Observation: {resultado_ferramenta}"
+                partes_prompt = ["Observation: ", registro.resultado_ferramenta]
 
                 log.iteracoes.append(registro)
                 continue
@@ -162,14 +173,15 @@ def _salvar_log(log: AgentLog, nome_base: str) -> None:
     """
     Serializa o AgentLog para dois formatos usando o mesmo objeto Pydantic.
 
-    .model_dump_json() e metodo nativo do Pydantic v2 que converte toda a
-    estrutura aninhada (incluindo lista de AgentIteration) para JSON valido,
-    respeitando tipos e nomes dos campos declarados no modelo.
+    .model_dump(mode="json") converte toda a estrutura aninhada (incluindo
+    lista de AgentIteration) para tipos JSON, respeitando os nomes dos campos
+    declarados no modelo. orjson gera os bytes UTF-8 direto, sem a string
+    intermediaria de .model_dump_json() nem uma nova codificacao na escrita.
     """
 
     # JSON estruturado — facil de processar programaticamente
-    with open(f"{nome_base}.json", "w", encoding="utf-8") as f:
-        f.write(log.model_dump_json(indent=2))
+    with open(f"{nome_base}.json", "wb") as f:
+        f.write(orjson.dumps(log.model_dump(mode="json"), option=orjson.OPT_INDENT_2))
 
     # TXT legivel — gerado a partir do mesmo objeto Pydantic
     with open(f"{nome_base}.txt", "w", encoding="utf-8") as f: